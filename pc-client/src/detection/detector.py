@@ -9,6 +9,7 @@ import mss
 from PIL import Image
 
 from server.config import AppConfig, PixelProbe, Region
+from server.preview import FrameStore
 from server.state import QueueState
 
 
@@ -17,11 +18,14 @@ class QueueDetector:
         self,
         config: AppConfig,
         on_state_change: Callable[[QueueState], Awaitable[None]],
+        frames: FrameStore | None = None,
     ) -> None:
         self._config = config
         self._on_state_change = on_state_change
+        self._frames = frames
         self._running = False
         self._last_state: QueueState | None = None
+        self._preview_task: asyncio.Task | None = None
         self._ocr_available = importlib.util.find_spec("pytesseract") is not None
 
     async def run(self) -> None:
@@ -32,10 +36,14 @@ class QueueDetector:
                 if detected_state != self._last_state:
                     self._last_state = detected_state
                     await self._on_state_change(detected_state)
+                if detected_state != QueueState.match_found:
+                    self._schedule_queue_preview()
                 await asyncio.sleep(self._config.poll_interval_s)
 
     def stop(self) -> None:
         self._running = False
+        if self._preview_task is not None:
+            self._preview_task.cancel()
 
     def _detect_state(self, grabber: mss.mss) -> QueueState:
         if self._match_found(grabber, self._config.accept_region, self._config.accept_pixel_probe):
@@ -45,9 +53,7 @@ class QueueDetector:
     def _region_is_configured(self, region: Region) -> bool:
         return region.width > 0 and region.height > 0
 
-    def _match_found(self, grabber: mss.mss, region: Region, probe: PixelProbe) -> bool:
-        if not self._region_is_configured(region):
-            return False
+    def _grab(self, grabber: mss.mss, region: Region) -> Image.Image:
         sample = grabber.grab(
             {
                 "left": region.x,
@@ -56,7 +62,31 @@ class QueueDetector:
                 "height": region.height,
             }
         )
-        image = Image.frombytes("RGB", sample.size, sample.rgb)
+        return Image.frombytes("RGB", sample.size, sample.rgb)
+
+    def _schedule_queue_preview(self) -> None:
+        if self._frames is None or not self._frames.has_viewers("queue_region"):
+            return
+        if not self._region_is_configured(self._config.queue_region):
+            return
+        if self._preview_task is not None and not self._preview_task.done():
+            return
+        self._preview_task = asyncio.create_task(self._publish_queue_frame(self._config.queue_region))
+
+    async def _publish_queue_frame(self, region: Region) -> None:
+        image = await asyncio.to_thread(self._grab_in_thread, region)
+        self._frames.publish("queue_region", image)
+
+    def _grab_in_thread(self, region: Region) -> Image.Image:
+        with mss.mss() as grabber:
+            return self._grab(grabber, region)
+
+    def _match_found(self, grabber: mss.mss, region: Region, probe: PixelProbe) -> bool:
+        if not self._region_is_configured(region):
+            return False
+        image = self._grab(grabber, region)
+        if self._frames is not None:
+            self._frames.publish("accept_region", image)
         if self._pixel_probe_match(image, probe):
             return True
         if self._ocr_available:
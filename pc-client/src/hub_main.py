@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import uvicorn
+
+from server.config import load_hub_config
+
+
+def main() -> None:
+    config = load_hub_config()
+    uvicorn.run(
+        "server.hub:app",
+        host=config.bind_host,
+        port=config.bind_port,
+        reload=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import io
-import json
+from contextlib import aclosing
 from typing import Any, Dict, List
 
-import qrcode
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from automation.input_controller import InputController
@@ -15,16 +13,23 @@ from detection.detector import QueueDetector
 from server.auth import enforce_subnet, enforce_subnet_ws, require_token
 from server.config import AppConfig, load_config, save_config
 from server.logging_config import setup_logging
+from server.models import ToggleRequest
+from server.pairing import build_pairing_qr
+from server.preview import (
+    MJPEG_BOUNDARY,
+    PREVIEW_REGIONS,
+    FrameStore,
+    PreviewPacer,
+    mjpeg_parts,
+    preview_frames,
+)
 from server.state import AppState, QueueState
 
 app = FastAPI(title="Dota Auto-Accept Server")
 state = AppState()
 connected_clients: List[WebSocket] = []
 match_found_timeout_task: asyncio.Task | None = None
-
-
-class ToggleRequest(BaseModel):
-    enabled: bool
+frame_store = FrameStore()
 
 
 class StatusResponse(BaseModel):
@@ -79,7 +84,7 @@ async def startup() -> None:
     setup_logging(config.log_file)
     state.auto_accept_enabled = config.auto_accept_enabled
     app.state.config = config
-    detector = QueueDetector(config, handle_state_change)
+    detector = QueueDetector(config, handle_state_change, frame_store)
     app.state.detector = detector
     app.state.detector_task = asyncio.create_task(detector.run())
     app.state.input_controller = InputController(
@@ -158,6 +163,53 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         connected_clients.remove(websocket)
 
 
+@app.get("/preview")
+async def preview(
+    request: Request,
+    region: str = "accept_region",
+) -> StreamingResponse:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    if region not in PREVIEW_REGIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown preview region.",
+        )
+    pacer = PreviewPacer(config.preview_max_fps, config.preview_jpeg_quality)
+    return StreamingResponse(
+        mjpeg_parts(preview_frames(frame_store, region, pacer)),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+    )
+
+
+@app.websocket("/preview/ws")
+async def preview_websocket(websocket: WebSocket) -> None:
+    config = get_config()
+    if not enforce_subnet_ws(websocket.client.host if websocket.client else None, config.allowed_subnets):
+        await websocket.close(code=1008)
+        return
+    token = websocket.query_params.get("token")
+    if not token or token != config.auth_token:
+        await websocket.close(code=1008)
+        return
+    region = websocket.query_params.get("region", "accept_region")
+    if region not in PREVIEW_REGIONS:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    pacer = PreviewPacer(config.preview_max_fps, config.preview_jpeg_quality)
+    sender = asyncio.create_task(send_preview_frames(websocket, region, pacer))
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
 @app.get("/config")
 async def get_config_endpoint(request: Request) -> Dict[str, Any]:
     config = get_config()
@@ -191,30 +243,21 @@ async def pairing_qr(request: Request) -> Dict[str, Any]:
     config = get_config()
     enforce_subnet(request, config.allowed_subnets)
     require_token(request, config.auth_token)
-    payload = json.dumps(
-        {
-            "host": config.bind_host,
-            "port": config.bind_port,
-            "token": config.auth_token,
-        }
-    )
-    qr = qrcode.make(payload)
-    buffer = io.BytesIO()
-    qr.save(buffer, format="PNG")
-    encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return {"payload": payload, "qr_base64": encoded}
+    return build_pairing_qr(config.bind_host, config.bind_port, config.auth_token)
 
 
 def get_config() -> AppConfig:
     return app.state.config
 
 
-async def handle_match_found_timeout() -> None:
-    config = get_config()
-    if config.stop_after_match_found_s <= 0:
-        return
-    await asyncio.sleep(config.stop_after_match_found_s)
-    if state.queue_state == QueueState.match_found:
-        state.auto_accept_enabled = False
-        state.set_state(QueueState.idle, "timeout:auto_accept_disabled")
-        await broadcast({"type": "timeout", "payload": state.as_dict()})
+async def send_preview_frames(websocket: WebSocket, region: str, pacer: PreviewPacer) -> None:
+    try:
+        async with aclosing(preview_frames(frame_store, region, pacer)) as frames:
+            async for data in frames:
+                await websocket.send_bytes(data)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    try:
+        await websocket.close()
+    except RuntimeError:
+        pass
@@ -15,6 +15,13 @@ def resolve_config_path() -> Path:
     return env_path
 
 
+def resolve_hub_config_path() -> Path:
+    env_path = Path("hub.json")
+    if "PC_HUB_CONFIG" in os.environ:
+        env_path = Path(os.environ["PC_HUB_CONFIG"])
+    return env_path
+
+
 class Region(BaseModel):
     x: int = 0
     y: int = 0
@@ -43,6 +50,8 @@ class AppConfig(BaseModel):
     queue_region: Region = Field(default_factory=Region)
     accept_pixel_probe: PixelProbe = Field(default_factory=PixelProbe)
     poll_interval_s: float = 0.75
+    preview_max_fps: float = 4.0
+    preview_jpeg_quality: int = 70
     allowed_subnets: List[str] = Field(
         default_factory=lambda: ["127.0.0.1/32", "192.168.0.0/16", "10.0.0.0/8"]
     )
@@ -55,6 +64,20 @@ class AppConfig(BaseModel):
             raise ValueError("bind_port must be a valid TCP port")
         return value
 
+    @field_validator("preview_max_fps")
+    @classmethod
+    def validate_preview_fps(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("preview_max_fps must be > 0")
+        return value
+
+    @field_validator("preview_jpeg_quality")
+    @classmethod
+    def validate_preview_quality(cls, value: int) -> int:
+        if value < 1 or value > 95:
+            raise ValueError("preview_jpeg_quality must be between 1 and 95")
+        return value
+
     @model_validator(mode="after")
     def validate_delays(self) -> "AppConfig":
         if self.accept_delay_min_s > self.accept_delay_max_s:
@@ -65,6 +88,57 @@ class AppConfig(BaseModel):
         return json.dumps(self.model_dump(), indent=2)
 
 
+class HubInstance(BaseModel):
+    name: str
+    base_url: str
+    auth_token: str = "change-me"
+
+    @field_validator("base_url")
+    @classmethod
+    def validate_base_url(cls, value: str) -> str:
+        if not value.startswith(("http://", "https://")):
+            raise ValueError("base_url must start with http:// or https://")
+        return value.rstrip("/")
+
+
+class HubConfig(BaseModel):
+    bind_host: str = "127.0.0.1"
+    bind_port: int = 8766
+    auth_token: str = "change-me"
+    instances: List[HubInstance] = Field(default_factory=list)
+    max_concurrent_forwards: int = 4
+    forward_timeout_s: float = 5.0
+    reconnect_delay_s: float = 2.0
+    allowed_subnets: List[str] = Field(
+        default_factory=lambda: ["127.0.0.1/32", "192.168.0.0/16", "10.0.0.0/8"]
+    )
+    log_file: str = "pc-hub.log"
+
+    @field_validator("bind_port")
+    @classmethod
+    def validate_port(cls, value: int) -> int:
+        if value <= 0 or value >= 65536:
+            raise ValueError("bind_port must be a valid TCP port")
+        return value
+
+    @field_validator("max_concurrent_forwards")
+    @classmethod
+    def validate_max_concurrent_forwards(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("max_concurrent_forwards must be >= 1")
+        return value
+
+    @model_validator(mode="after")
+    def validate_instance_names(self) -> "HubConfig":
+        names = [instance.name for instance in self.instances]
+        if len(names) != len(set(names)):
+            raise ValueError("instance names must be unique")
+        return self
+
+    def to_json(self) -> str:
+        return json.dumps(self.model_dump(), indent=2)
+
+
 def load_config(path: Path | None = None) -> AppConfig:
     config_path = path or resolve_config_path()
     if not config_path.exists():
@@ -78,3 +152,13 @@ def load_config(path: Path | None = None) -> AppConfig:
 def save_config(config: AppConfig, path: Path | None = None) -> None:
     config_path = path or resolve_config_path()
     config_path.write_text(config.to_json())
+
+
+def load_hub_config(path: Path | None = None) -> HubConfig:
+    config_path = path or resolve_hub_config_path()
+    if not config_path.exists():
+        config = HubConfig()
+        config_path.write_text(config.to_json())
+        return config
+    data: Any = json.loads(config_path.read_text())
+    return HubConfig.model_validate(data)
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List
+from urllib.parse import urlencode
+
+import httpx
+import websockets
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+
+from server.auth import enforce_subnet, enforce_subnet_ws, require_token
+from server.config import HubConfig, HubInstance, load_hub_config
+from server.logging_config import setup_logging
+from server.models import ToggleRequest
+from server.pairing import build_pairing_qr
+
+logger = logging.getLogger(__name__)
+
+StreamFactory = Callable[[HubInstance], AsyncIterator[Dict[str, Any]]]
+ClientFactory = Callable[[HubInstance, HubConfig], httpx.AsyncClient]
+MessageHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+PHONE_QUEUE_SIZE = 32
+
+app = FastAPI(title="Dota Auto-Accept Hub")
+connected_clients: Dict[WebSocket, asyncio.Queue[Dict[str, Any]]] = {}
+
+
+def create_http_client(
+    instance: HubInstance,
+    config: HubConfig,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=instance.base_url,
+        transport=transport,
+        headers={"X-Auth-Token": instance.auth_token},
+        timeout=config.forward_timeout_s,
+        limits=httpx.Limits(
+            max_connections=config.max_concurrent_forwards,
+            max_keepalive_connections=config.max_concurrent_forwards,
+        ),
+    )
+
+
+def websocket_url(instance: HubInstance) -> str:
+    scheme, rest = instance.base_url.split("://", 1)
+    ws_scheme = "wss" if scheme == "https" else "ws"
+    return f"{ws_scheme}://{rest}/ws?{urlencode({'token': instance.auth_token})}"
+
+
+async def websocket_stream(instance: HubInstance) -> AsyncIterator[Dict[str, Any]]:
+    async with websockets.connect(websocket_url(instance)) as connection:
+        async for raw in connection:
+            yield json.loads(raw)
+
+
+class InstanceLink:
+    def __init__(
+        self,
+        instance: HubInstance,
+        http_client: httpx.AsyncClient,
+        stream: StreamFactory,
+        on_message: MessageHandler,
+        reconnect_delay_s: float,
+    ) -> None:
+        self.instance = instance
+        self.http_client = http_client
+        self.connected = False
+        self.last_status: Dict[str, Any] | None = None
+        self.last_update_at: str | None = None
+        self._stream = stream
+        self._on_message = on_message
+        self._reconnect_delay_s = reconnect_delay_s
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async for message in self._stream(self.instance):
+                    await self._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Stream from %s failed: %s", self.instance.name, exc)
+            if self.connected:
+                self.connected = False
+                await self._on_message(
+                    self.instance.name,
+                    {"type": "connection", "payload": self.last_status, "link": self.link_info()},
+                )
+            await asyncio.sleep(self._reconnect_delay_s)
+
+    async def forward(self, path: str, payload: Dict[str, Any] | None) -> Dict[str, Any]:
+        try:
+            response = await self.http_client.post(path, json=payload)
+        except httpx.HTTPError as exc:
+            return {"ok": False, "status_code": None, "error": str(exc)}
+        result: Dict[str, Any] = {"ok": response.is_success, "status_code": response.status_code}
+        try:
+            result["body"] = response.json()
+        except ValueError:
+            result["body"] = response.text
+        return result
+
+    def link_info(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "last_update_at": self.last_update_at,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**self.link_info(), "status": self.last_status}
+
+    async def _handle_message(self, message: Dict[str, Any]) -> None:
+        self.connected = True
+        payload = message.get("payload")
+        if isinstance(payload, dict):
+            self.last_status = payload
+        self.last_update_at = datetime.now(timezone.utc).isoformat()
+        await self._on_message(self.instance.name, message)
+
+
+class Hub:
+    def __init__(
+        self,
+        config: HubConfig,
+        client_factory: ClientFactory | None = None,
+        stream: StreamFactory | None = None,
+    ) -> None:
+        self._config = config
+        self._semaphore = asyncio.Semaphore(config.max_concurrent_forwards)
+        self._tasks: List[asyncio.Task] = []
+        self._subscribers: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+        client_factory = client_factory or create_http_client
+        stream = stream or websocket_stream
+        self.links: Dict[str, InstanceLink] = {
+            instance.name: InstanceLink(
+                instance,
+                client_factory(instance, config),
+                stream,
+                self._publish,
+                config.reconnect_delay_s,
+            )
+            for instance in config.instances
+        }
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        self._subscribers.append(callback)
+
+    async def start(self) -> None:
+        for link in self.links.values():
+            self._tasks.append(asyncio.create_task(link.run()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for link in self.links.values():
+            await link.http_client.aclose()
+
+    def status(self) -> Dict[str, Any]:
+        return {"hosts": {name: link.as_dict() for name, link in self.links.items()}}
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {"type": "state", "host": name, "payload": link.last_status}
+            for name, link in self.links.items()
+            if link.last_status is not None
+        ]
+
+    async def forward(
+        self,
+        path: str,
+        payload: Dict[str, Any] | None = None,
+        host: str | None = None,
+    ) -> Dict[str, Any]:
+        if host is not None and host not in self.links:
+            raise KeyError(host)
+        targets = [self.links[host]] if host is not None else list(self.links.values())
+        results = await asyncio.gather(*(self._bounded_forward(link, path, payload) for link in targets))
+        return {"results": {link.instance.name: result for link, result in zip(targets, results)}}
+
+    async def _bounded_forward(
+        self,
+        link: InstanceLink,
+        path: str,
+        payload: Dict[str, Any] | None,
+    ) -> Dict[str, Any]:
+        async with self._semaphore:
+            return await link.forward(path, payload)
+
+    async def _publish(self, host: str, message: Dict[str, Any]) -> None:
+        tagged = {**message, "host": host}
+        for callback in self._subscribers:
+            await callback(tagged)
+
+
+async def broadcast(message: Dict[str, Any]) -> None:
+    for queue in connected_clients.values():
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+@app.on_event("startup")
+async def startup() -> None:
+    config = load_hub_config()
+    setup_logging(config.log_file)
+    app.state.config = config
+    hub = Hub(config)
+    hub.subscribe(broadcast)
+    app.state.hub = hub
+    await hub.start()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await app.state.hub.stop()
+
+
+@app.get("/status")
+async def get_status(request: Request) -> Dict[str, Any]:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    return get_hub().status()
+
+
+@app.post("/toggle-auto-accept")
+async def toggle_auto_accept(
+    payload: ToggleRequest,
+    request: Request,
+    host: str | None = None,
+) -> Dict[str, Any]:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    return await forward_or_404("/toggle-auto-accept", payload.model_dump(), host)
+
+
+@app.post("/start-queue")
+async def start_queue(request: Request, host: str | None = None) -> Dict[str, Any]:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    return await forward_or_404("/start-queue", None, host)
+
+
+@app.post("/stop-queue")
+async def stop_queue(request: Request, host: str | None = None) -> Dict[str, Any]:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    return await forward_or_404("/stop-queue", None, host)
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket) -> None:
+    config = get_config()
+    if not enforce_subnet_ws(websocket.client.host if websocket.client else None, config.allowed_subnets):
+        await websocket.close(code=1008)
+        return
+    token = websocket.query_params.get("token")
+    if not token or token != config.auth_token:
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    hub = get_hub()
+    queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max(PHONE_QUEUE_SIZE, len(hub.links)))
+    for message in hub.snapshot():
+        queue.put_nowait(message)
+    connected_clients[websocket] = queue
+    sender = asyncio.create_task(send_queued(websocket, queue))
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        connected_clients.pop(websocket, None)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+@app.get("/pairing-qr")
+async def pairing_qr(request: Request) -> Dict[str, Any]:
+    config = get_config()
+    enforce_subnet(request, config.allowed_subnets)
+    require_token(request, config.auth_token)
+    return build_pairing_qr(config.bind_host, config.bind_port, config.auth_token)
+
+
+def get_config() -> HubConfig:
+    return app.state.config
+
+
+def get_hub() -> Hub:
+    return app.state.hub
+
+
+async def forward_or_404(path: str, payload: Dict[str, Any] | None, host: str | None) -> Dict[str, Any]:
+    try:
+        return await get_hub().forward(path, payload, host)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown host: {host}",
+        )
+
+
+async def send_queued(websocket: WebSocket, queue: asyncio.Queue[Dict[str, Any]]) -> None:
+    try:
+        while True:
+            await websocket.send_json(await queue.get())
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    try:
+        await websocket.close()
+    except RuntimeError:
+        pass
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+from typing import Any, Dict
+
+import qrcode
+
+
+def build_pairing_qr(host: str, port: int, token: str) -> Dict[str, Any]:
+    payload = json.dumps(
+        {
+            "host": host,
+            "port": port,
+            "token": token,
+        }
+    )
+    qr = qrcode.make(payload)
+    buffer = io.BytesIO()
+    qr.save(buffer, format="PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    return {"payload": payload, "qr_base64": encoded}
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Tuple
+
+from PIL import Image
+
+PREVIEW_REGIONS = ("accept_region", "queue_region")
+MJPEG_BOUNDARY = "frame"
+MIN_FPS = 0.5
+MIN_QUALITY = 30
+QUALITY_STEP = 10
+
+
+@dataclass
+class Frame:
+    seq: int
+    image: Image.Image
+
+
+class FrameStore:
+    def __init__(self) -> None:
+        self.viewers: Dict[str, int] = {region: 0 for region in PREVIEW_REGIONS}
+        self._seq = 0
+        self._frames: Dict[str, Frame] = {}
+        self._encoded: Dict[Tuple[str, int, int], bytes] = {}
+        self._changed = asyncio.Event()
+
+    def has_viewers(self, region: str) -> bool:
+        return self.viewers.get(region, 0) > 0
+
+    def publish(self, region: str, image: Image.Image) -> None:
+        self._seq += 1
+        self._frames[region] = Frame(self._seq, image)
+        self._encoded = {key: data for key, data in self._encoded.items() if key[0] != region}
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def latest(self, region: str) -> Frame | None:
+        return self._frames.get(region)
+
+    async def wait_for_frame(self, region: str, after_seq: int) -> Frame:
+        while True:
+            frame = self._frames.get(region)
+            if frame is not None and frame.seq > after_seq:
+                return frame
+            await self._changed.wait()
+
+    async def encode(self, region: str, frame: Frame, quality: int) -> bytes:
+        key = (region, frame.seq, quality)
+        data = self._encoded.get(key)
+        if data is None:
+            data = await asyncio.to_thread(encode_jpeg, frame.image, quality)
+            current = self._frames.get(region)
+            if current is not None and current.seq == frame.seq:
+                self._encoded[key] = data
+        return data
+
+
+class PreviewPacer:
+    def __init__(self, max_fps: float, max_quality: int) -> None:
+        self.max_fps = max_fps
+        self.max_quality = max_quality
+        self.min_fps = min(MIN_FPS, max_fps)
+        self.min_quality = min(MIN_QUALITY, max_quality)
+        self.fps = self.max_fps
+        self.quality = self.max_quality
+
+    @property
+    def interval_s(self) -> float:
+        return 1.0 / self.fps
+
+    def record(self, send_s: float) -> None:
+        budget = self.interval_s
+        if send_s > budget / 2:
+            self.quality = max(self.min_quality, self.quality - QUALITY_STEP)
+            if self.quality == self.min_quality:
+                self.fps = max(self.min_fps, self.fps / 2)
+        elif send_s < budget / 10:
+            if self.fps < self.max_fps:
+                self.fps = min(self.max_fps, self.fps * 2)
+            else:
+                self.quality = min(self.max_quality, self.quality + QUALITY_STEP)
+
+
+def mjpeg_part(data: bytes) -> bytes:
+    header = (
+        f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n"
+    )
+    return header.encode("ascii") + data + b"\r\n"
+
+
+async def mjpeg_parts(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    async with aclosing(frames):
+        async for data in frames:
+            yield mjpeg_part(data)
+
+
+def encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+async def preview_frames(
+    store: FrameStore,
+    region: str,
+    pacer: PreviewPacer,
+) -> AsyncIterator[bytes]:
+    store.viewers[region] = store.viewers.get(region, 0) + 1
+    try:
+        last_seq = 0
+        while True:
+            frame = await store.wait_for_frame(region, last_seq)
+            last_seq = frame.seq
+            data = await store.encode(region, frame, pacer.quality)
+            started = time.monotonic()
+            yield data
+            send_s = time.monotonic() - started
+            pacer.record(send_s)
+            remaining = pacer.interval_s - send_s
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+    finally:
+        store.viewers[region] -= 1
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server import hub as hub_module
+from server.config import HubConfig, HubInstance
+from server.hub import Hub
+
+
+class InFlight:
+    def __init__(self) -> None:
+        self.current = 0
+        self.peak = 0
+
+
+class FakeInstance:
+    def __init__(self, name: str, in_flight: InFlight | None = None) -> None:
+        self.name = name
+        self.messages: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+        self.requests: List[str] = []
+        self.in_flight = in_flight or InFlight()
+        self.app = FastAPI()
+
+        @self.app.post("/toggle-auto-accept")
+        async def toggle(payload: Dict[str, Any]) -> Dict[str, Any]:
+            await self._track("/toggle-auto-accept")
+            return {"auto_accept_enabled": payload["enabled"]}
+
+        @self.app.post("/start-queue")
+        async def start_queue() -> Dict[str, Any]:
+            await self._track("/start-queue")
+            return {"queue_state": "searching"}
+
+    async def _track(self, path: str) -> None:
+        self.requests.append(path)
+        self.in_flight.current += 1
+        self.in_flight.peak = max(self.in_flight.peak, self.in_flight.current)
+        await asyncio.sleep(0.01)
+        self.in_flight.current -= 1
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            yield await self.messages.get()
+
+
+def build_hub(fakes: Dict[str, FakeInstance], max_concurrent_forwards: int = 4) -> Hub:
+    config = HubConfig(
+        instances=[HubInstance(name=name, base_url=f"http://{name}") for name in fakes],
+        max_concurrent_forwards=max_concurrent_forwards,
+        reconnect_delay_s=0.01,
+    )
+
+    def client_factory(instance: HubInstance, hub_config: HubConfig) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=fakes[instance.name].app)
+        return httpx.AsyncClient(transport=transport, base_url=instance.base_url)
+
+    def stream(instance: HubInstance) -> AsyncIterator[Dict[str, Any]]:
+        return fakes[instance.name].stream()
+
+    return Hub(config, client_factory=client_factory, stream=stream)
+
+
+def test_hub_merges_tagged_streams_and_caches_status() -> None:
+    async def scenario() -> None:
+        fakes = {"pc-1": FakeInstance("pc-1"), "pc-2": FakeInstance("pc-2")}
+        hub = build_hub(fakes)
+        received: List[Dict[str, Any]] = []
+
+        async def collect(message: Dict[str, Any]) -> None:
+            received.append(message)
+
+        hub.subscribe(collect)
+        await hub.start()
+        await fakes["pc-1"].messages.put({"type": "state", "payload": {"queue_state": "searching"}})
+        await fakes["pc-2"].messages.put({"type": "state", "payload": {"queue_state": "match_found"}})
+        await asyncio.sleep(0.05)
+        await hub.stop()
+
+        assert {(m["host"], m["payload"]["queue_state"]) for m in received} == {
+            ("pc-1", "searching"),
+            ("pc-2", "match_found"),
+        }
+        hosts = hub.status()["hosts"]
+        assert hosts["pc-1"]["connected"] is True
+        assert hosts["pc-1"]["status"] == {"queue_state": "searching"}
+        assert hosts["pc-2"]["status"] == {"queue_state": "match_found"}
+
+    asyncio.run(scenario())
+
+
+def test_hub_forwards_with_bounded_concurrency() -> None:
+    async def scenario() -> None:
+        in_flight = InFlight()
+        fakes = {f"pc-{i}": FakeInstance(f"pc-{i}", in_flight) for i in range(5)}
+        hub = build_hub(fakes, max_concurrent_forwards=2)
+        body = await hub.forward("/toggle-auto-accept", {"enabled": False})
+        await hub.stop()
+
+        assert set(body["results"]) == set(fakes)
+        for result in body["results"].values():
+            assert result["ok"] is True
+            assert result["body"] == {"auto_accept_enabled": False}
+        assert in_flight.peak == 2
+        assert all(fake.requests == ["/toggle-auto-accept"] for fake in fakes.values())
+
+    asyncio.run(scenario())
+
+
+def test_hub_forwards_to_single_host() -> None:
+    async def scenario() -> None:
+        fakes = {"pc-1": FakeInstance("pc-1"), "pc-2": FakeInstance("pc-2")}
+        hub = build_hub(fakes)
+        body = await hub.forward("/start-queue", host="pc-2")
+        await hub.stop()
+
+        assert list(body["results"]) == ["pc-2"]
+        assert fakes["pc-1"].requests == []
+        assert fakes["pc-2"].requests == ["/start-queue"]
+
+    asyncio.run(scenario())
+
+
+def test_hub_status_endpoint(tmp_path: Path, monkeypatch: Any) -> None:
+    config = HubConfig(
+        auth_token="hub-token",
+        allowed_subnets=["127.0.0.1/32"],
+        instances=[HubInstance(name="pc-1", base_url="http://pc-1")],
+        log_file=str(tmp_path / "hub.log"),
+    )
+    path = tmp_path / "hub.json"
+    path.write_text(json.dumps(config.model_dump(), indent=2))
+    monkeypatch.setenv("PC_HUB_CONFIG", str(path))
+
+    async def idle_stream(instance: HubInstance) -> AsyncIterator[Dict[str, Any]]:
+        await asyncio.Event().wait()
+        yield {}
+
+    monkeypatch.setattr(hub_module, "websocket_stream", idle_stream)
+    with TestClient(hub_module.app) as client:
+        assert client.get("/status").status_code == 401
+        response = client.get("/status", headers={"X-Auth-Token": "hub-token"})
+        assert response.status_code == 200
+        assert response.json() == {
+            "hosts": {"pc-1": {"connected": False, "last_update_at": None, "status": None}}
+        }
+        missing = client.post("/start-queue?host=pc-9", headers={"X-Auth-Token": "hub-token"})
+        assert missing.status_code == 404
+        pairing = client.get("/pairing-qr", headers={"X-Auth-Token": "hub-token"})
+        assert pairing.status_code == 200
+        assert json.loads(pairing.json()["payload"])["token"] == "hub-token"
+
+
+def test_disconnect_keeps_state_shaped_payload() -> None:
+    async def scenario() -> None:
+        fakes = {"pc-1": FakeInstance("pc-1")}
+        received: List[Dict[str, Any]] = []
+
+        async def collect(message: Dict[str, Any]) -> None:
+            received.append(message)
+
+        async def one_message(instance: HubInstance) -> AsyncIterator[Dict[str, Any]]:
+            yield {"type": "state", "payload": {"queue_state": "searching"}}
+            raise ConnectionError("gone")
+
+        hub = build_hub(fakes)
+        hub.links["pc-1"]._stream = one_message
+        hub.subscribe(collect)
+        await hub.start()
+        await asyncio.sleep(0.005)
+        await hub.stop()
+
+        connection = next(m for m in received if m["type"] == "connection")
+        assert connection["payload"] == {"queue_state": "searching"}
+        assert connection["link"]["connected"] is False
+
+    asyncio.run(scenario())
+
+
+def test_broadcast_drops_oldest_for_slow_phone() -> None:
+    async def scenario() -> None:
+        queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=hub_module.PHONE_QUEUE_SIZE)
+        hub_module.connected_clients[object()] = queue
+        try:
+            for index in range(hub_module.PHONE_QUEUE_SIZE + 5):
+                await hub_module.broadcast({"type": "state", "seq": index})
+        finally:
+            hub_module.connected_clients.clear()
+
+        assert queue.qsize() == hub_module.PHONE_QUEUE_SIZE
+        assert queue.get_nowait()["seq"] == 5
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("host_count", [1, hub_module.PHONE_QUEUE_SIZE + 8])
+def test_hub_websocket_sends_tagged_snapshot(tmp_path: Path, monkeypatch: Any, host_count: int) -> None:
+    names = [f"pc-{index}" for index in range(host_count)]
+    config = HubConfig(
+        auth_token="hub-token",
+        allowed_subnets=["127.0.0.1/32"],
+        instances=[HubInstance(name=name, base_url=f"http://{name}") for name in names],
+        log_file=str(tmp_path / "hub.log"),
+    )
+    path = tmp_path / "hub.json"
+    path.write_text(json.dumps(config.model_dump(), indent=2))
+    monkeypatch.setenv("PC_HUB_CONFIG", str(path))
+    reported: List[str] = []
+
+    async def one_state(instance: HubInstance) -> AsyncIterator[Dict[str, Any]]:
+        yield {"type": "state", "payload": {"queue_state": "idle"}}
+        reported.append(instance.name)
+        await asyncio.Event().wait()
+
+    async def all_reported() -> None:
+        while len(reported) < host_count:
+            await asyncio.sleep(0.001)
+
+    monkeypatch.setattr(hub_module, "websocket_stream", one_state)
+    with TestClient(hub_module.app) as client:
+        client.portal.call(all_reported)
+        with client.websocket_connect("/ws?token=hub-token") as websocket:
+            messages = [websocket.receive_json() for _ in names]
+    assert messages == [
+        {"type": "state", "host": name, "payload": {"queue_state": "idle"}} for name in names
+    ]
+    assert hub_module.connected_clients == {}
+
+
+def test_websocket_url_uses_scheme_and_encodes_token() -> None:
+    plain = HubInstance(name="pc-1", base_url="http://192.168.1.20:8765", auth_token="a b&c")
+    secure = HubInstance(name="pc-2", base_url="https://pc-2.lan:8765/", auth_token="tok")
+
+    assert hub_module.websocket_url(plain) == "ws://192.168.1.20:8765/ws?token=a+b%26c"
+    assert hub_module.websocket_url(secure) == "wss://pc-2.lan:8765/ws?token=tok"
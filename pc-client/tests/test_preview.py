@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from PIL import Image
+from pydantic import ValidationError
+
+from detection.detector import QueueDetector
+from server.config import AppConfig, Region
+from server.preview import MIN_QUALITY, FrameStore, PreviewPacer, mjpeg_parts, preview_frames
+from server.state import QueueState
+
+
+def make_image(color: tuple[int, int, int]) -> Image.Image:
+    return Image.new("RGB", (16, 8), color=color)
+
+
+class StubSample:
+    def __init__(self, width: int, height: int) -> None:
+        self.size = (width, height)
+        self.rgb = bytes([0, 200, 0]) * width * height
+
+
+class StubGrabber:
+    def __init__(self) -> None:
+        self.grabs: List[Dict[str, int]] = []
+
+    def grab(self, monitor: Dict[str, int]) -> StubSample:
+        self.grabs.append(monitor)
+        return StubSample(monitor["width"], monitor["height"])
+
+
+async def ignore_state(new_state: QueueState) -> None:
+    return None
+
+
+def make_detector(frames: FrameStore) -> QueueDetector:
+    config = AppConfig(
+        accept_region=Region(x=10, y=20, width=16, height=8),
+        queue_region=Region(x=30, y=40, width=16, height=8),
+    )
+    return QueueDetector(config, ignore_state, frames)
+
+
+def test_viewer_gets_latest_frame_and_skips_stale_ones() -> None:
+    async def scenario() -> None:
+        store = FrameStore()
+        frames = preview_frames(store, "accept_region", PreviewPacer(max_fps=100.0, max_quality=70))
+        store.publish("accept_region", make_image((255, 0, 0)))
+        first = await frames.__anext__()
+        assert store.has_viewers("accept_region")
+        assert not store.has_viewers("queue_region")
+        store.publish("accept_region", make_image((0, 255, 0)))
+        store.publish("accept_region", make_image((0, 0, 255)))
+        second = await frames.__anext__()
+        await frames.aclose()
+
+        assert first.startswith(b"\xff\xd8")
+        assert not store.has_viewers("accept_region")
+        _, _, blue = Image.open(io.BytesIO(second)).getpixel((8, 4))
+        assert blue > 200
+
+    asyncio.run(scenario())
+
+
+def test_encoded_frame_is_shared_between_viewers() -> None:
+    async def scenario() -> None:
+        store = FrameStore()
+        store.publish("queue_region", make_image((10, 20, 30)))
+        frame = store.latest("queue_region")
+        assert frame is not None
+        first = await store.encode("queue_region", frame, 70)
+        second = await store.encode("queue_region", frame, 70)
+        assert first is second
+
+    asyncio.run(scenario())
+
+
+def test_pacer_backs_off_and_recovers() -> None:
+    pacer = PreviewPacer(max_fps=4.0, max_quality=70)
+    for _ in range(10):
+        pacer.record(1.0)
+    assert pacer.quality == MIN_QUALITY
+    assert pacer.fps < 4.0
+    for _ in range(10):
+        pacer.record(0.0)
+    assert pacer.fps == 4.0
+    assert pacer.quality == 70
+
+
+def test_pacer_never_exceeds_configured_caps() -> None:
+    config = AppConfig(preview_jpeg_quality=10, preview_max_fps=0.2)
+    pacer = PreviewPacer(config.preview_max_fps, config.preview_jpeg_quality)
+    assert (pacer.fps, pacer.quality) == (0.2, 10)
+    for _ in range(10):
+        pacer.record(100.0)
+    assert pacer.fps <= 0.2
+    assert pacer.quality == 10
+
+
+@pytest.mark.parametrize("fps", [0.0, -3.0])
+def test_config_rejects_non_positive_preview_fps(fps: float) -> None:
+    with pytest.raises(ValidationError):
+        AppConfig(preview_max_fps=fps)
+
+
+def test_mjpeg_parts_frames_each_jpeg() -> None:
+    async def frames() -> AsyncIterator[bytes]:
+        yield b"\xff\xd8abc"
+        yield b"\xff\xd8"
+
+    async def collect() -> List[bytes]:
+        return [part async for part in mjpeg_parts(frames())]
+
+    assert asyncio.run(collect()) == [
+        b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 5\r\n\r\n\xff\xd8abc\r\n",
+        b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 2\r\n\r\n\xff\xd8\r\n",
+    ]
+
+
+def test_detector_publishes_accept_frame_it_already_grabbed() -> None:
+    frames = FrameStore()
+    grabber = StubGrabber()
+    detector = make_detector(frames)
+
+    assert detector._detect_state(grabber) == QueueState.match_found
+    frame = frames.latest("accept_region")
+
+    assert grabber.grabs == [{"left": 10, "top": 20, "width": 16, "height": 8}]
+    assert frame is not None
+    assert frame.image.getpixel((8, 4)) == (0, 200, 0)
+    assert frames.latest("queue_region") is None
+
+
+def test_detector_grabs_queue_region_only_for_its_viewers(monkeypatch: Any) -> None:
+    async def scenario() -> None:
+        frames = FrameStore()
+        detector = make_detector(frames)
+        grabbed: List[Region] = []
+
+        def fake_grab(region: Region) -> Image.Image:
+            grabbed.append(region)
+            return make_image((1, 2, 3))
+
+        monkeypatch.setattr(detector, "_grab_in_thread", fake_grab)
+        frames.viewers["accept_region"] = 1
+        detector._schedule_queue_preview()
+        assert detector._preview_task is None
+
+        frames.viewers["queue_region"] = 1
+        detector._schedule_queue_preview()
+        assert detector._preview_task is not None
+        await detector._preview_task
+
+        frame = frames.latest("queue_region")
+        assert grabbed == [detector._config.queue_region]
+        assert frame is not None
+        assert frame.image.getpixel((0, 0)) == (1, 2, 3)
+
+    asyncio.run(scenario())
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from pathlib import Path
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
-from server.app import app
-from server.config import AppConfig
+from PIL import Image
+
+from server.app import app, frame_store
+from server.config import AppConfig, HubConfig, HubInstance
+from server.hub import Hub, create_http_client
 
 
 def write_config(tmp_path: Path) -> Path:
@@ -43,3 +50,68 @@ def test_toggle_auto_accept(tmp_path: Path) -> None:
     assert response.status_code == 200
     body = response.json()
     assert body["auto_accept_enabled"] is False
+
+
+def test_preview_requires_token(tmp_path: Path) -> None:
+    config_path = write_config(tmp_path)
+    os.environ["PC_CLIENT_CONFIG"] = str(config_path)
+    with TestClient(app) as client:
+        response = client.get("/preview")
+        assert response.status_code == 401
+        response = client.get("/preview?region=elsewhere")
+        assert response.status_code == 401
+        response = client.get("/preview?region=elsewhere", headers={"X-Auth-Token": "test-token"})
+        assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["token=wrong-token", "token=test-token&region=elsewhere"],
+)
+def test_preview_websocket_rejects_bad_token_or_region(tmp_path: Path, query: str) -> None:
+    config_path = write_config(tmp_path)
+    os.environ["PC_CLIENT_CONFIG"] = str(config_path)
+    with TestClient(app) as client:
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            with client.websocket_connect(f"/preview/ws?{query}"):
+                pass
+        assert excinfo.value.code == 1008
+
+
+def test_hub_forwards_to_real_server_with_token_header(tmp_path: Path) -> None:
+    config_path = write_config(tmp_path)
+    os.environ["PC_CLIENT_CONFIG"] = str(config_path)
+    hub_config = HubConfig(
+        instances=[
+            HubInstance(name="pc-1", base_url="http://pc-1", auth_token="test-token"),
+            HubInstance(name="pc-2", base_url="http://pc-2", auth_token="wrong-token"),
+        ]
+    )
+
+    def client_factory(instance: HubInstance, config: HubConfig) -> httpx.AsyncClient:
+        return create_http_client(instance, config, transport=httpx.ASGITransport(app=app))
+
+    async def scenario() -> dict:
+        hub = Hub(hub_config, client_factory=client_factory)
+        try:
+            return await hub.forward("/toggle-auto-accept", {"enabled": False})
+        finally:
+            await hub.stop()
+
+    with TestClient(app):
+        body = asyncio.run(scenario())
+    results = body["results"]
+    assert results["pc-1"]["status_code"] == 200
+    assert results["pc-1"]["body"] == {"auto_accept_enabled": False}
+    assert results["pc-2"]["status_code"] == 401
+
+
+def test_preview_websocket_sends_jpeg_frames(tmp_path: Path) -> None:
+    config_path = write_config(tmp_path)
+    os.environ["PC_CLIENT_CONFIG"] = str(config_path)
+    image = Image.new("RGB", (16, 8), color=(0, 200, 0))
+    with TestClient(app) as client:
+        client.portal.call(frame_store.publish, "accept_region", image)
+        with client.websocket_connect("/preview/ws?token=test-token&region=accept_region") as websocket:
+            data = websocket.receive_bytes()
+    assert data.startswith(b"\xff\xd8")